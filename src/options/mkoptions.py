@@ -40,31 +40,59 @@
         - <dst>/options.cpp
 """
 
+import functools
 import os
 import re
 import sys
+import tempfile
 import textwrap
-import toml
+
+# Prefer a fast parser: tomllib is part of the standard library since Python
+# 3.11 and tomli is its backport for older versions, rtoml is a Rust-based
+# parser. Fall back to the (slow) pure-Python toml module otherwise.
+try:
+    import tomllib as toml
+except ImportError:
+    try:
+        import tomli as toml
+    except ImportError:
+        try:
+            import rtoml as toml
+        except ImportError:
+            import toml
 
 ### Allowed attributes for module/option
 
-MODULE_ATTR_REQ = ['id', 'name']
-MODULE_ATTR_ALL = MODULE_ATTR_REQ + ['option', 'public']
+MODULE_ATTR_REQ = frozenset(['id', 'name'])
+MODULE_ATTR_ALL = MODULE_ATTR_REQ | frozenset(['option', 'public'])
 
-OPTION_ATTR_REQ = ['category', 'type']
-OPTION_ATTR_ALL = OPTION_ATTR_REQ + [
+OPTION_ATTR_REQ = frozenset(['category', 'type'])
+OPTION_ATTR_ALL = OPTION_ATTR_REQ | frozenset([
     'name', 'short', 'long', 'alias',
     'default', 'alternate', 'mode',
     'handler', 'predicates', 'includes',
     'help', 'help_mode'
-]
+])
 
 CATEGORY_VALUES = ['common', 'expert', 'regular', 'undocumented']
-SUPPORTED_CTYPES = ['int', 'unsigned', 'unsigned long', 'double']
+SUPPORTED_CTYPES = frozenset(['int', 'unsigned', 'unsigned long', 'double'])
+NUMERIC_CTYPE_REGEX = re.compile(r'u?int[0-9]+_t\Z')
+NO_ARGUMENT_CTYPES = frozenset(['bool', 'void'])  # options without argument
+LONG_OPTION_REGEX = re.compile(r'^[0-9a-zA-Z\-=]+$')
+TPL_PLACEHOLDER_REGEX = re.compile(r'\$\{(\w+)\}\$')
 
-### Other globals
+### Help text formatting
 
-g_long_cache = dict()      # maps long options to filename/fileno
+HELP_WIDTH = 80      # width of the cmdline documentation (--help)
+HELP_WIDTH_OPT = 25  # width of the column listing the option names
+
+# Text wrappers are stateless, hence we create them only once.
+HELP_WRAPPER = textwrap.TextWrapper(
+    width=HELP_WIDTH - HELP_WIDTH_OPT, break_on_hyphens=False)
+HELP_MODE_WRAPPER = textwrap.TextWrapper(
+    width=HELP_WIDTH - 2, break_on_hyphens=False)
+
+### Other globals
 
 g_getopt_long_start = 256
 
@@ -87,19 +115,32 @@ void assign_{module}_{name}(Options& opts, const std::string& option, bool value
   Trace("options") << "user assigned option {name} = " << value << std::endl;
 }}'''
 
-TPL_CALL_ASSIGN_BOOL = '    assign_{module}_{name}(opts, {option}, {value});'
-TPL_CALL_ASSIGN = '    assign_{module}_{name}(opts, {option}, optionarg);'
+
+def tpl_call_assign_bool(module, name, option, value):
+    return f'    assign_{module}_{name}(opts, {option}, {value});'
+
+
+def tpl_call_assign(module, name, option):
+    return f'    assign_{module}_{name}(opts, {option}, optionarg);'
+
 
 TPL_CALL_SET_OPTION = 'setOption(std::string("{smtname}"), ("{value}"));'
 
-TPL_GETOPT_LONG = '{{ "{}", {}_argument, nullptr, {} }},'
 
-TPL_HOLDER_MACRO_ATTR = '''  {type} {name};
+def tpl_getopt_long(long_name, argument, value):
+    return f'{{ "{long_name}", {argument}_argument, nullptr, {value} }},'
+
+
+def tpl_holder_macro_attr(type, name):
+    return f'''  {type} {name};
   bool {name}WasSetByUser = false;'''
 
-TPL_HOLDER_MACRO_ATTR_DEF = '''  {type} {name} = {default};
+
+def tpl_holder_macro_attr_def(type, name, default):
+    return f'''  {type} {name} = {default};
   bool {name}WasSetByUser = false;'''
 
+
 TPL_DECL_SET_DEFAULT = 'void setDefault{funcname}(Options& opts, {type} value);'
 TPL_IMPL_SET_DEFAULT = TPL_DECL_SET_DEFAULT[:-1] + '''
 {{
@@ -110,7 +151,7 @@ TPL_IMPL_SET_DEFAULT = TPL_DECL_SET_DEFAULT[:-1] + '''
 
 TPL_NAME_DECL = 'static constexpr const char* {name}__name = "{long_name}";'
 
-TPL_OPTION_STRUCT_RW = \
+TPL_OPTION_STRUCT = \
 """extern struct {name}__option_t
 {{
   typedef {type} type;
@@ -119,10 +160,12 @@ TPL_OPTION_STRUCT_RW = \
 
 # Option specific methods
 
-TPL_IMPL_OP_PAR = \
-"""inline {type} {name}__option_t::operator()() const
+
+def tpl_impl_op_par(module, name, type):
+    return f"""inline {type} {name}__option_t::operator()() const
 {{ return Options::current().{module}.{name}; }}"""
 
+
 # Mode templates
 TPL_DECL_MODE_ENUM = \
 """
@@ -177,7 +220,7 @@ TPL_MODE_HANDLER_CASE = \
 
 def concat_format(s, objs):
     """Helper method to render a string for a list of object"""
-    return '\n'.join([s.format(**o.__dict__) for o in objs])
+    return '\n'.join([s.format(**o.attributes()) for o in objs])
 
 
 def get_holder_fwd_decls(modules):
@@ -240,14 +283,22 @@ class Module(object):
     An options module represents a MODULE_options.toml option configuration
     file and contains lists of options.
     """
+    __slots__ = tuple(MODULE_ATTR_ALL) + \
+        ('options', 'id_cap', 'filename', 'header')
+
     def __init__(self, d, filename):
-        self.__dict__ = {k: d.get(k, None) for k in MODULE_ATTR_ALL}
+        for k in MODULE_ATTR_ALL:
+            setattr(self, k, d.get(k, None))
         self.options = []
         self.id = self.id.lower()
         self.id_cap = self.id.upper()
         self.filename = os.path.splitext(os.path.split(filename)[-1])[0]
         self.header = os.path.join('options', '{}.h'.format(self.filename))
 
+    def attributes(self):
+        """Return all attributes of this module as dictionary."""
+        return {k: getattr(self, k) for k in self.__slots__}
+
 
 class Option(object):
     """Module option.
@@ -255,16 +306,19 @@ class Option(object):
     An instance of this class corresponds to an option defined in a
     MODULE_options.toml configuration file specified via [[option]].
     """
+    __slots__ = tuple(OPTION_ATTR_ALL) + ('filename', 'long_name', 'long_opt')
+
     def __init__(self, d):
-        self.__dict__ = dict((k, None) for k in OPTION_ATTR_ALL)
+        for k in OPTION_ATTR_ALL:
+            setattr(self, k, None)
         self.includes = []
         self.predicates = []
         self.alternate = True    # add --no- alternative long option for bool
         self.filename = None
         for (attr, val) in d.items():
-            assert attr in self.__dict__
+            assert attr in OPTION_ATTR_ALL
             if attr == 'alternate' or val:
-                self.__dict__[attr] = val
+                setattr(self, attr, val)
         self.long_name = None
         self.long_opt = None
         if self.long:
@@ -378,72 +432,118 @@ def die(msg):
 def perr(filename, msg, option=None):
     msg_suffix = ''
     if option:
-        if option.name:
-            msg_suffix = "option '{}' ".format(option.name)
-        else:
-            msg_suffix = "option '{}' ".format(option.long)
-    die('parse error in {}: {}{}'.format(filename, msg, msg_suffix))
+        msg_suffix = f"option '{option.name or option.long}' "
+    die(f'parse error in {filename}: {msg}{msg_suffix}')
+
+
+def file_has_contents(fname, data, chunk_size=1 << 16):
+    """
+    Check if file fname exists and its contents are equal to the bytes 'data'.
+    The file is compared chunk by chunk and we stop at the first difference.
+    """
+    if not os.path.isfile(fname) or os.path.getsize(fname) != len(data):
+        return False
+    with open(fname, 'rb') as file:
+        pos = 0
+        while True:
+            chunk = file.read(chunk_size)
+            if not chunk:
+                return pos == len(data)
+            if chunk != data[pos:pos + len(chunk)]:
+                return False
+            pos += len(chunk)
 
 
 def write_file(directory, name, content):
     """
     Write string 'content' to file directory/name. If the file already exists,
     we first check if the contents of the file is different from 'content'
-    before overwriting the file.
+    before overwriting the file. The file is replaced atomically, such that
+    an interrupted run never leaves a partially written file behind.
     """
     fname = os.path.join(directory, name)
+    data = content.encode('utf-8')
+    tmp = None
     try:
-        if os.path.isfile(fname):
-            with open(fname, 'r') as file:
-                if content == file.read():
-                    return
-        with open(fname, 'w') as file:
-            file.write(content)
+        if file_has_contents(fname, data):
+            return
+        fd, tmp = tempfile.mkstemp(dir=directory, prefix=name + '.',
+                                   suffix='.tmp')
+        with os.fdopen(fd, 'wb') as file:
+            file.write(data)
+        # mkstemp creates the file with mode 0600, use the default mode
+        umask = os.umask(0)
+        os.umask(umask)
+        os.chmod(tmp, 0o666 & ~umask)
+        os.replace(tmp, fname)
+        tmp = None
     except IOError:
         die("Could not write '{}'".format(fname))
+    finally:
+        # Remove the temporary file if it was not moved to fname (e.g., if
+        # the build was interrupted)
+        if tmp and os.path.exists(tmp):
+            os.unlink(tmp)
 
 
 def read_tpl(directory, name):
     """
-    Read a template file directory/name. The contents of the template file will
-    be read into a string, which will later be used to fill in the generated
-    code/documentation via format. Hence, we have to escape curly braces. All
-    placeholder variables in the template files are enclosed in ${placeholer}$
-    and will be {placeholder} in the returned string.
+    Read a template file directory/name. All placeholder variables in the
+    template files are enclosed in ${placeholder}$. The template is split into
+    a list of alternating literal text and placeholder names (at odd
+    positions), which is later filled in with the generated code/documentation
+    via render_tpl.
     """
     fname = os.path.join(directory, name)
     try:
-        # Escape { and } since we later use .format to add the generated code.
-        # Further, strip ${ and }$ from placeholder variables in the template
-        # file.
         with open(fname, 'r') as file:
-            contents = \
-                file.read().replace('{', '{{').replace('}', '}}').\
-                            replace('${', '').replace('}$', '')
-            return contents
+            return TPL_PLACEHOLDER_REGEX.split(file.read())
     except IOError:
         die("Could not find '{}'. Aborting.".format(fname))
 
 
+def render_tpl(tpl, **subs):
+    """
+    Render template tpl (as returned by read_tpl) by replacing each
+    placeholder with the corresponding value in subs.
+    """
+    return ''.join([str(subs[x]) if i % 2 else x for i, x in enumerate(tpl)])
+
+
+def read_toml(filename):
+    """
+    Parse the option configuration file 'filename' and return its contents as
+    dictionary.
+    """
+    try:
+        # Configuration files are small, read them at once and parse from
+        # memory (TOML files are always UTF-8 encoded).
+        with open(filename, 'rb') as file:
+            data = file.read()
+        return toml.loads(data.decode('utf-8'))
+    except IOError:
+        die("Could not read '{}'. Aborting.".format(filename))
+
+
+@functools.lru_cache(maxsize=None)
 def long_get_option(name):
     """
     Extract the name of a given long option long=ARG
     """
-    return name.split('=')[0]
+    return name.partition('=')[0]
 
 
+@functools.lru_cache(maxsize=None)
 def is_numeric_cpp_type(ctype):
     """
     Check if given type is a numeric C++ type (this should cover the most
     common cases).
     """
-    if ctype in SUPPORTED_CTYPES:
-        return True
-    elif re.match('u?int[0-9]+_t', ctype):
-        return True
-    return False
+    return ctype in SUPPORTED_CTYPES or \
+        NUMERIC_CTYPE_REGEX.match(ctype) is not None
 
 
+@functools.lru_cache(maxsize=None)
 def format_include(include):
     """
     Generate the #include directive for a given header name.
@@ -484,17 +584,13 @@ def help_format(help_msg, opts):
     """
     Format cmdline documentation (--help) to be 80 chars wide.
     """
-    width = 80
-    width_opt = 25
-    wrapper = \
-        textwrap.TextWrapper(width=width - width_opt, break_on_hyphens=False)
-    text = wrapper.wrap(help_msg.replace('"', '\\"'))
-    if len(opts) > width_opt - 3:
+    text = HELP_WRAPPER.wrap(help_msg.replace('"', '\\"'))
+    if len(opts) > HELP_WIDTH_OPT - 3:
         lines = ['  {}'.format(opts)]
-        lines.append(' ' * width_opt + text[0])
+        lines.append(' ' * HELP_WIDTH_OPT + text[0])
     else:
-        lines = ['  {}{}'.format(opts.ljust(width_opt - 2), text[0])]
-    lines.extend([' ' * width_opt + l for l in text[1:]])
+        lines = ['  {}{}'.format(opts.ljust(HELP_WIDTH_OPT - 2), text[0])]
+    lines.extend([' ' * HELP_WIDTH_OPT + l for l in text[1:]])
     return ['"{}\\n"'.format(x) for x in lines]
 
 def help_mode_format(option):
@@ -504,9 +600,8 @@ def help_mode_format(option):
     assert option.help_mode
     assert option.mode
 
-    wrapper = textwrap.TextWrapper(width=78, break_on_hyphens=False)
-    text = ['{}'.format(x) for x in wrapper.wrap(option.help_mode)]
-    text.append('Available modes for --{} are:'.format(option.long.split('=')[0]))
+    text = ['{}'.format(x) for x in HELP_MODE_WRAPPER.wrap(option.help_mode)]
+    text.append('Available modes for --{} are:'.format(option.long_name))
 
     for value, attrib in option.mode.items():
         assert len(attrib) == 1
@@ -516,11 +611,20 @@ def help_mode_format(option):
         else:
             text.append('+ {}'.format(attrib['name']))
         if 'help' in attrib:
-            text.extend('  {}'.format(x) for x in wrapper.wrap(attrib['help']))
+            text.extend('  {}'.format(x)
+                        for x in HELP_MODE_WRAPPER.wrap(attrib['help']))
 
     return '\n         '.join('"{}\\n"'.format(x) for x in text)
 
 
+def option_sort_key(option):
+    """
+    Key for sorting options by their long option name (or their name if no
+    long option is defined).
+    """
+    return option.long or option.name or ''
+
+
 def codegen_module(module, dst_dir, tpl_module_h, tpl_module_cpp):
     """
     Generate code for each option module (*_options.{h,cpp})
@@ -541,30 +645,25 @@ def codegen_module(module, dst_dir, tpl_module_h, tpl_module_cpp):
     accs = []
     defs = []
 
-    for option in \
-        sorted(module.options, key=lambda x: x.long if x.long else x.name):
+    for option in module.options:
         if option.name is None:
             continue
 
         ### Generate code for {module.name}_options.h
-        includes.update([format_include(x) for x in option.includes])
+        includes.update(format_include(x) for x in option.includes)
 
         # Generate option holder macro
         if option.default:
             default = option.default
             if option.mode and option.type not in default:
                 default = '{}::{}'.format(option.type, default)
-            holder_specs.append(TPL_HOLDER_MACRO_ATTR_DEF.format(type=option.type, name=option.name, default=default))
+            holder_specs.append(tpl_holder_macro_attr_def(option.type, option.name, default))
         else:
-            holder_specs.append(TPL_HOLDER_MACRO_ATTR.format(type=option.type, name=option.name))
+            holder_specs.append(tpl_holder_macro_attr(option.type, option.name))
 
         # Generate module declaration
-        tpl_decl = TPL_OPTION_STRUCT_RW
-        if option.long:
-            long_name = option.long.split('=')[0]
-        else:
-            long_name = ""
-        decls.append(tpl_decl.format(name=option.name, type=option.type, long_name = long_name))
+        long_name = option.long_name or ""
+        decls.append(TPL_OPTION_STRUCT.format(name=option.name, type=option.type, long_name = long_name))
         option_names.append(TPL_NAME_DECL.format(name=option.name, type=option.type, long_name = long_name))
 
         capoptionname = option.name[0].capitalize() + option.name[1:]
@@ -572,19 +671,19 @@ def codegen_module(module, dst_dir, tpl_module_h, tpl_module_cpp):
         # Generate module specialization
         default_decl.append(TPL_DECL_SET_DEFAULT.format(module=module.id, name=option.name, funcname=capoptionname, type=option.type))
 
-        if option.long and option.type not in ['bool', 'void'] and \
+        if option.long and option.type not in NO_ARGUMENT_CTYPES and \
            '=' not in option.long:
             die("module '{}': option '{}' with type '{}' needs an argument " \
                 "description ('{}=...')".format(
                     module.id, option.long, option.type, option.long))
-        elif option.long and option.type in ['bool', 'void'] and \
+        elif option.long and option.type in NO_ARGUMENT_CTYPES and \
              '=' in option.long:
             die("module '{}': option '{}' with type '{}' must not have an " \
                 "argument description".format(
                     module.id, option.long, option.type))
 
         # Generate module inlines
-        inls.append(TPL_IMPL_OP_PAR.format(module=module.id, name=option.name, type=option.type))
+        inls.append(tpl_impl_op_par(module.id, option.name, option.type))
 
 
         ### Generate code for {module.name}_options.cpp
@@ -626,7 +725,7 @@ def codegen_module(module, dst_dir, tpl_module_h, tpl_module_cpp):
                     type=option.type,
                     cases='\n  else '.join(cases),
                     help=help_mode_format(option),
-                    long=option.long.split('=')[0]))
+                    long=option.long_name))
 
     if module.public:
         visibility_include = '#include "cvc5_public.h"'
@@ -634,11 +733,11 @@ def codegen_module(module, dst_dir, tpl_module_h, tpl_module_cpp):
         visibility_include = '#include "cvc5_private.h"'
 
     filename = os.path.splitext(os.path.split(module.header)[1])[0]
-    write_file(dst_dir, '{}.h'.format(filename), tpl_module_h.format(
+    write_file(dst_dir, '{}.h'.format(filename), render_tpl(tpl_module_h,
         visibility_include=visibility_include,
         id_cap=module.id_cap,
         id=module.id,
-        includes='\n'.join(sorted(list(includes))),
+        includes='\n'.join(sorted(includes)),
         holder_spec='\n'.join(holder_specs),
         decls='\n'.join(decls),
         specs='\n'.join(specs),
@@ -647,7 +746,7 @@ def codegen_module(module, dst_dir, tpl_module_h, tpl_module_cpp):
         defaults='\n'.join(default_decl),
         modes=''.join(mode_decl)))
 
-    write_file(dst_dir, '{}.cpp'.format(filename), tpl_module_cpp.format(
+    write_file(dst_dir, '{}.cpp'.format(filename), render_tpl(tpl_module_cpp,
         header=module.header,
         id=module.id,
         accs='\n'.join(accs),
@@ -671,7 +770,7 @@ def docgen_option(option, help_common, help_others):
     opts = help_format_options(option)
 
     # Generate documentation for cmdline options
-    if opts and option.category != 'undocumented':
+    if opts:
         help_cmd = help_msg
         if option.type == 'bool' and option.alternate:
             help_cmd += ' [*]'
@@ -693,7 +792,7 @@ def add_getopt_long(long_name, argument_req, getopt_long):
     """
     value = g_getopt_long_start + len(getopt_long)
     getopt_long.append(
-        TPL_GETOPT_LONG.format(
+        tpl_getopt_long(
             long_get_option(long_name),
             'required' if argument_req else 'no', value))
 
@@ -719,6 +818,9 @@ def codegen_all_modules(modules, build_dir, dst_dir, tpl_options_h, tpl_options_
 
     sphinxgen = SphinxGenerator()
 
+    # Bind to local, since it is accessed for each long option
+    getopt_long_start = g_getopt_long_start
+
     for module in modules:
         headers_module.append(format_include(module.header))
 
@@ -726,11 +828,10 @@ def codegen_all_modules(modules, build_dir, dst_dir, tpl_options_h, tpl_options_
             help_others.append(
                 '"\\nFrom the {} module:\\n"'.format(module.name))
 
-        for option in \
-            sorted(module.options, key=lambda x: x.long if x.long else x.name):
+        for option in module.options:
             assert option.type != 'void' or option.name is None
             assert option.name or option.short or option.long
-            argument_req = option.type not in ['bool', 'void']
+            argument_req = option.type not in NO_ARGUMENT_CTYPES
 
             docgen_option(option, help_common, help_others)
 
@@ -754,38 +855,37 @@ def codegen_all_modules(modules, build_dir, dst_dir, tpl_options_h, tpl_options_
             if option.long:
                 cases.append(
                     'case {}: // --{}'.format(
-                        g_getopt_long_start + len(getopt_long),
+                        getopt_long_start + len(getopt_long),
                         option.long))
                 add_getopt_long(option.long, argument_req, getopt_long)
                 if option.alias:
                     for alias in option.alias:
                         cases.append(
                             'case {}: // --{}'.format(
-                                g_getopt_long_start + len(getopt_long),
+                                getopt_long_start + len(getopt_long),
                                 alias))
                         add_getopt_long(alias, argument_req, getopt_long)
 
             if cases:
                 if option.type == 'bool' and option.name:
                     cases.append(
-                        TPL_CALL_ASSIGN_BOOL.format(
+                        tpl_call_assign_bool(
                             module=module.id,
                             name=option.name,
                             option='option',
                             value='true'))
                 elif option.type != 'void' and option.name:
                     cases.append(
-                        TPL_CALL_ASSIGN.format(
+                        tpl_call_assign(
                             module=module.id,
                             name=option.name,
-                            option='option',
-                            value='optionarg'))
+                            option='option'))
                 elif handler:
                     cases.append('{};'.format(handler))
 
                 cases.append('  break;')
 
-                options_handler.extend(cases)
+                options_handler.append('\n    '.join(cases))
 
 
             # Generate handlers for setOption/getOption
@@ -793,7 +893,7 @@ def codegen_all_modules(modules, build_dir, dst_dir, tpl_options_h, tpl_options_
                 # Make long and alias names available via set/get-option
                 keys = set()
                 if option.long:
-                    keys.add(long_get_option(option.long))
+                    keys.add(option.long_name)
                 if option.alias:
                     keys.update(option.alias)
                 assert keys
@@ -801,49 +901,39 @@ def codegen_all_modules(modules, build_dir, dst_dir, tpl_options_h, tpl_options_
                 cond = ' || '.join(
                     ['key == "{}"'.format(x) for x in sorted(keys)])
 
-                setoption_handlers.append('if({}) {{'.format(cond))
+                # Each handler is rendered as a single block of lines
                 if option.type == 'bool':
-                    setoption_handlers.append(
-                        TPL_CALL_ASSIGN_BOOL.format(
-                            module=module.id,
-                            name=option.name,
-                            option='key',
-                            value='optionarg == "true"'))
+                    assign = tpl_call_assign_bool(
+                        module=module.id,
+                        name=option.name,
+                        option='key',
+                        value='optionarg == "true"') + '\n'
                 elif argument_req and option.name:
-                    setoption_handlers.append(
-                        TPL_CALL_ASSIGN.format(
-                            module=module.id,
-                            name=option.name,
-                            option='key'))
+                    assign = tpl_call_assign(
+                        module=module.id,
+                        name=option.name,
+                        option='key') + '\n'
                 elif option.handler:
-                    h = 'handler->{handler}("{smtname}", key'
-                    if argument_req:
-                        h += ', optionarg'
-                    h += ');'
-                    setoption_handlers.append(
-                        h.format(handler=option.handler, smtname=option.long_name))
-
-                setoption_handlers.append('return;')
-                setoption_handlers.append('}')
+                    optarg = ', optionarg' if argument_req else ''
+                    assign = f'handler->{option.handler}' \
+                             f'("{option.long_name}", key{optarg});\n'
+                else:
+                    assign = ''
+                setoption_handlers.append(
+                    f'if({cond}) {{\n{assign}return;\n}}')
 
                 if option.name:
-                    getoption_handlers.append(
-                        'if ({}) {{'.format(cond))
+                    value = f'options.{module.id}.{option.name}'
                     if option.type == 'bool':
-                        getoption_handlers.append(
-                            'return options.{}.{} ? "true" : "false";'.format(module.id, option.name))
+                        ret = f'return {value} ? "true" : "false";'
                     elif option.type == 'std::string':
-                        getoption_handlers.append(
-                            'return options.{}.{};'.format(module.id, option.name))
+                        ret = f'return {value};'
                     elif is_numeric_cpp_type(option.type):
-                        getoption_handlers.append(
-                            'return std::to_string(options.{}.{});'.format(module.id, option.name))
+                        ret = f'return std::to_string({value});'
                     else:
-                        getoption_handlers.append('std::stringstream ss;')
-                        getoption_handlers.append(
-                            'ss << options.{}.{};'.format(module.id, option.name))
-                        getoption_handlers.append('return ss.str();')
-                    getoption_handlers.append('}')
+                        ret = f'std::stringstream ss;\nss << {value};\n' \
+                              'return ss.str();'
+                    getoption_handlers.append(f'if ({cond}) {{\n{ret}\n}}')
 
 
             # Add --no- alternative options for boolean options
@@ -851,26 +941,26 @@ def codegen_all_modules(modules, build_dir, dst_dir, tpl_options_h, tpl_options_
                 cases = []
                 cases.append(
                     'case {}:// --no-{}'.format(
-                        g_getopt_long_start + len(getopt_long),
+                        getopt_long_start + len(getopt_long),
                         option.long))
 
-                add_getopt_long('no-{}'.format(option.long), argument_req,
+                add_getopt_long(f'no-{option.long}', argument_req,
                                 getopt_long)
                 if option.alias:
                     for alias in option.alias:
                         cases.append(
                             'case {}:// --no-{}'.format(
-                                g_getopt_long_start + len(getopt_long),
+                                getopt_long_start + len(getopt_long),
                                 alias))
-                        add_getopt_long('no-{}'.format(alias), argument_req,
+                        add_getopt_long(f'no-{alias}', argument_req,
                                 getopt_long)
 
                 cases.append(
-                    TPL_CALL_ASSIGN_BOOL.format(
+                    tpl_call_assign_bool(
                         module=module.id,
                         name=option.name, option='option', value='false'))
                 cases.append('  break;')
-                options_handler.extend(cases)
+                options_handler.append('\n    '.join(cases))
 
             optname = option.long
             # collect options available to the SMT-frontend
@@ -880,9 +970,6 @@ def codegen_all_modules(modules, build_dir, dst_dir, tpl_options_h, tpl_options_
             if option.name:
                 # Build options for options::getOptions()
                 if optname:
-                    # collect SMT option names
-                    options_smt.append('"{}",'.format(optname))
-
                     if option.type == 'bool':
                         s = 'opts.push_back({{"{}", {}.{} ? "true" : "false"}});'.format(
                             optname, module.id, option.name)
@@ -919,15 +1006,15 @@ def codegen_all_modules(modules, build_dir, dst_dir, tpl_options_h, tpl_options_
                 defaults.append('{}({})'.format(option.name, default))
                 defaults.append('{}WasSetByUser(false)'.format(option.name))
 
-    write_file(dst_dir, 'options.h', tpl_options_h.format(
+    write_file(dst_dir, 'options.h', render_tpl(tpl_options_h,
         holder_fwd_decls=get_holder_fwd_decls(modules),
         holder_mem_decls=get_holder_mem_decls(modules),
         holder_ref_decls=get_holder_ref_decls(modules),
     ))
 
-    write_file(dst_dir, 'options.cpp', tpl_options_cpp.format(
+    write_file(dst_dir, 'options.cpp', render_tpl(tpl_options_cpp,
         headers_module='\n'.join(headers_module),
-        headers_handler='\n'.join(sorted(list(headers_handler))),
+        headers_handler='\n'.join(sorted(headers_handler)),
         holder_mem_copy=get_holder_mem_copy(modules),
         holder_mem_inits=get_holder_mem_inits(modules),
         holder_ref_inits=get_holder_ref_inits(modules),
@@ -938,8 +1025,8 @@ def codegen_all_modules(modules, build_dir, dst_dir, tpl_options_h, tpl_options_
         cmdline_options='\n  '.join(getopt_long),
         options_short=''.join(getopt_short),
         options_handler='\n    '.join(options_handler),
-        option_value_begin=g_getopt_long_start,
-        option_value_end=g_getopt_long_start + len(getopt_long),
+        option_value_begin=getopt_long_start,
+        option_value_end=getopt_long_start + len(getopt_long),
         options_smt='\n  '.join(options_smt),
         options_getoptions='\n  '.join(options_getoptions),
         setoption_handlers='\n'.join(setoption_handlers),
@@ -950,68 +1037,77 @@ def codegen_all_modules(modules, build_dir, dst_dir, tpl_options_h, tpl_options_
         sphinxgen.render('{}/docs/'.format(build_dir), 'options_generated.rst')
 
 
+def attribs_for(attribs):
+    """
+    Describe the module/option given by attributes attribs for error messages.
+    Only called on errors, since it is not needed otherwise.
+    """
+    if 'name' in attribs:
+        return f" for '{attribs['name']}'"
+    elif 'long' in attribs:
+        return f" for '{attribs['long']}'"
+    return ''
+
+
 def check_attribs(filename, req_attribs, valid_attribs, attribs, ctype):
     """
     Check if for a given module/option the defined attributes are valid and
     if all required attributes are defined.
     """
-    msg_for = ""
-    if 'name' in attribs:
-        msg_for = " for '{}'".format(attribs['name'])
-    elif 'long' in attribs:
-        msg_for = " for '{}'".format(attribs['long'])
-    for k in req_attribs:
-        if k not in attribs:
-            perr(filename,
-                 "required {} attribute '{}' not specified{}".format(
-                     ctype, k, msg_for))
-    for k in attribs:
-        if k not in valid_attribs:
-            perr(filename,
-                 "invalid {} attribute '{}' specified{}".format(
-                     ctype, k, msg_for))
+    missing = req_attribs - attribs.keys()
+    if missing:
+        k = min(missing)
+        perr(filename,
+             f"required {ctype} attribute '{k}' not specified"
+             f"{attribs_for(attribs)}")
+    invalid = attribs.keys() - valid_attribs
+    if invalid:
+        # Report the first invalid attribute as specified in the file
+        k = next(k for k in attribs if k in invalid)
+        perr(filename,
+             f"invalid {ctype} attribute '{k}' specified"
+             f"{attribs_for(attribs)}")
 
 
 def check_unique(filename, value, cache):
     """
     Check if given name is unique in cache.
     """
-    if value in cache:
-        perr(filename,
-             "'{}' already defined in '{}'".format(value, cache[value]))
-    else:
-        cache[value] = filename
+    # Note: setdefault only inserts value if it is not yet in the cache, which
+    # requires a single lookup.
+    size = len(cache)
+    prev = cache.setdefault(value, filename)
+    if len(cache) == size:
+        perr(filename, f"'{value}' already defined in '{prev}'")
 
 
-def check_long(filename, option, long_name, ctype=None):
+def check_long(long_cache, filename, option, long_name, ctype=None):
     """
     Check if given long option name is valid.
     """
-    global g_long_cache
     if long_name is None:
         return
     if long_name.startswith('--'):
         perr(filename, 'remove -- prefix from long', option)
-    r = r'^[0-9a-zA-Z\-=]+$'
-    if not re.match(r, long_name):
+    if not LONG_OPTION_REGEX.match(long_name):
         perr(filename,
-             "long '{}' does not match regex criteria '{}'".format(
-                 long_name, r), option)
+             f"long '{long_name}' does not match regex criteria "
+             f"'{LONG_OPTION_REGEX.pattern}'", option)
     name = long_get_option(long_name)
-    check_unique(filename, name, g_long_cache)
+    check_unique(filename, name, long_cache)
 
     if ctype == 'bool':
-        check_unique(filename, 'no-{}'.format(name), g_long_cache)
+        check_unique(filename, f'no-{name}', long_cache)
 
 
 def parse_module(filename, module):
     """
     Parse options module file.
 
-    Note: We could use an existing toml parser to parse the configuration
-    files.  However, since we only use a very restricted feature set of the
-    toml format, we chose to implement our own parser to get better error
-    messages.
+    Note: The configuration files are parsed with an existing toml parser
+    (see read_toml). However, since we only use a very restricted feature set
+    of the toml format, we check the parsed attributes ourselves to get better
+    error messages.
     """
     # Check if parsed module attributes are valid and if all required
     # attributes are defined.
@@ -1029,22 +1125,20 @@ def parse_module(filename, module):
             if option.mode and option.handler:
                 perr(filename, 'defines modes and a handler', option)
             if option.mode and option.default and \
-                    option.default not in option.mode.keys():
+                    option.default not in option.mode:
                 perr(filename,
-                     "invalid default value '{}'".format(option.default),
-                     option)
+                     f"invalid default value '{option.default}'", option)
             if option.short and not option.long:
                 perr(filename,
-                     "short option '{}' specified but no long option".format(
-                         option.short),
-                     option)
+                     f"short option '{option.short}' specified but no long "
+                     "option", option)
             if option.type == 'bool' and option.handler:
                 perr(filename,
                      'defining handlers for bool options is not allowed',
                      option)
             if option.category != 'undocumented' and not option.help:
                 perr(filename,
-                     'help text required for {} options'.format(option.category),
+                     f'help text required for {option.category} options',
                      option)
             option.filename = filename
             res.options.append(option)
@@ -1091,14 +1185,18 @@ def mkoptions_main():
 
     # Parse files, check attributes and create module/option objects
     modules = []
+    long_cache = {}  # maps long options to filename
     for filename in filenames:
-        module = parse_module(filename, toml.load(filename))
+        module = parse_module(filename, read_toml(filename))
 
         # Check if long options are valid and unique.  First populate
-        # g_long_cache with option.long and --no- alternatives if
+        # long_cache with option.long and --no- alternatives if
         # applicable.
         for option in module.options:
-            check_long(filename, option, option.long, option.type)
+            check_long(long_cache, filename, option, option.long, option.type)
+
+        # Code generation processes the options of a module in sorted order.
+        module.options.sort(key=option_sort_key)
         modules.append(module)
 
     # Create *_options.{h,cpp} in destination directory
@@ -24,78 +24,80 @@ def solver():
     return pycvc5.Solver()
 
 
-def test_add_rule(solver):
-    boolean = solver.getBooleanSort()
-    integer = solver.getIntegerSort()
+@pytest.fixture
+def boolean(solver):
+    return solver.getBooleanSort()
+
 
+def test_add_rule(solver, boolean):
     null_term = Term(solver)
     start = solver.mkVar(boolean)
     nts = solver.mkVar(boolean)
 
+    bool_false = solver.mkBoolean(False)
+
     # expecting no error
     g = solver.mkSygusGrammar([], [start])
 
-    g.addRule(start, solver.mkBoolean(False))
+    g.addRule(start, bool_false)
 
     # expecting errors
-    with pytest.raises(RuntimeError):
-        g.addRule(null_term, solver.mkBoolean(False))
-    with pytest.raises(RuntimeError):
-        g.addRule(start, null_term)
-    with pytest.raises(RuntimeError):
-        g.addRule(nts, solver.mkBoolean(False))
-    with pytest.raises(RuntimeError):
-        g.addRule(start, solver.mkInteger(0))
-    with pytest.raises(RuntimeError):
-        g.addRule(start, nts)
+    invalid = [
+        (null_term, bool_false),
+        (start, null_term),
+        (nts, bool_false),
+        (start, solver.mkInteger(0)),
+        (start, nts),
+    ]
+    for nt, rule in invalid:
+        with pytest.raises(RuntimeError):
+            g.addRule(nt, rule)
 
     # expecting no errors
-    solver.synthFun("f", {}, boolean, g)
+    solver.synthFun("f", [], boolean, g)
 
     # expecting an error
     with pytest.raises(RuntimeError):
-        g.addRule(start, solver.mkBoolean(False))
+        g.addRule(start, bool_false)
 
 
-def test_add_rules(solver):
-    boolean = solver.getBooleanSort()
-    integer = solver.getIntegerSort()
-
+def test_add_rules(solver, boolean):
     null_term = Term(solver)
     start = solver.mkVar(boolean)
     nts = solver.mkVar(boolean)
 
+    bool_false = solver.mkBoolean(False)
+
     g = solver.mkSygusGrammar([], [start])
 
-    g.addRules(start, {solver.mkBoolean(False)})
+    g.addRules(start, [bool_false])
 
     #Expecting errors
-    with pytest.raises(RuntimeError):
-        g.addRules(null_term, [solver.mkBoolean(False)])
-    with pytest.raises(RuntimeError):
-        g.addRules(start, [null_term])
-    with pytest.raises(RuntimeError):
-        g.addRules(nts, [solver.mkBoolean(False)])
-    with pytest.raises(RuntimeError):
-        g.addRules(start, [solver.mkInteger(0)])
-    with pytest.raises(RuntimeError):
-        g.addRules(start, [nts])
+    invalid = [
+        (null_term, bool_false),
+        (start, null_term),
+        (nts, bool_false),
+        (start, solver.mkInteger(0)),
+        (start, nts),
+    ]
+    for nt, rule in invalid:
+        with pytest.raises(RuntimeError):
+            g.addRules(nt, [rule])
+
     #Expecting no errors
-    solver.synthFun("f", {}, boolean, g)
+    solver.synthFun("f", [], boolean, g)
 
     #Expecting an error
     with pytest.raises(RuntimeError):
-        g.addRules(start, solver.mkBoolean(False))
-
+        g.addRules(start, [bool_false])
 
-def test_add_any_constant(solver):
-    boolean = solver.getBooleanSort()
 
+def test_add_any_constant(solver, boolean):
     null_term = Term(solver)
     start = solver.mkVar(boolean)
     nts = solver.mkVar(boolean)
 
-    g = solver.mkSygusGrammar({}, {start})
+    g = solver.mkSygusGrammar([], [start])
 
     g.addAnyConstant(start)
     g.addAnyConstant(start)
@@ -105,22 +107,20 @@ def test_add_any_constant(solver):
     with pytest.raises(RuntimeError):
         g.addAnyConstant(nts)
 
-    solver.synthFun("f", {}, boolean, g)
+    solver.synthFun("f", [], boolean, g)
 
     with pytest.raises(RuntimeError):
         g.addAnyConstant(start)
 
 
-def test_add_any_variable(solver):
-    boolean = solver.getBooleanSort()
-
+def test_add_any_variable(solver, boolean):
     null_term = Term(solver)
     x = solver.mkVar(boolean)
     start = solver.mkVar(boolean)
     nts = solver.mkVar(boolean)
 
-    g1 = solver.mkSygusGrammar({x}, {start})
-    g2 = solver.mkSygusGrammar({}, {start})
+    g1 = solver.mkSygusGrammar([x], [start])
+    g2 = solver.mkSygusGrammar([], [start])
 
     g1.addAnyVariable(start)
     g1.addAnyVariable(start)
@@ -131,7 +131,7 @@ def test_add_any_variable(solver):
     with pytest.raises(RuntimeError):
         g1.addAnyVariable(nts)
 
-    solver.synthFun("f", {}, boolean, g1)
+    solver.synthFun("f", [], boolean, g1)
 
     with pytest.raises(RuntimeError):
         g1.addAnyVariable(start)